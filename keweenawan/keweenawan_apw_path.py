@@ -1,5 +1,4 @@
 from __future__ import print_function
-import itertools
 import numpy as np
 import scipy.stats as st
 import pandas as pd
@@ -118,20 +117,17 @@ def plot_synthetic_paths( ax=None, title=''):
 
     direction_samples = path.euler_directions()
 
-    dist_colors = itertools.cycle([cmap_blue, cmap_red, cmap_green])
-    for directions in direction_samples:
-        mcplates.plot.plot_distribution(myax, directions[:, 0], directions[:, 1], cmap=dist_colors.next(), resolution=60)
+    dist_colors = [cmap_blue, cmap_red, cmap_green]
+    for i, directions in enumerate(direction_samples):
+        mcplates.plot.plot_distribution(myax, directions[:, 0], directions[:, 1], cmap=dist_colors[i % len(dist_colors)], resolution=60)
 
     mcplates.plot.plot_continent(myax, 'laurentia', rotation_pole=mcplates.Pole(0., 90., 1.0), angle=-lon_shift, color='k')
 
     pathlons, pathlats = path.compute_synthetic_paths(n=200)
-    for pathlon, pathlat in zip(pathlons, pathlats):
-        myax.plot(pathlon, pathlat, transform=ccrs.PlateCarree(),
-                  color='b', alpha=0.05)
+    mcplates.plot.plot_paths(myax, pathlons, pathlats, color='b', alpha=0.05)
 
-    colorcycle = itertools.cycle(colors)
-    for p in poles:
-        p.plot(myax, color=colorcycle.next())
+    for i, p in enumerate(poles):
+        p.plot(myax, color=colors[i % len(colors)])
 
     myax.scatter(slon, slat, transform=ccrs.PlateCarree(), c='k', marker="*", s=100)
 
@@ -152,9 +148,8 @@ def plot_age_samples(ax1=None, ax2=None, title1='', title2=''):
         myax1 = ax1
         myax2 = ax2
 
-    colorcycle = itertools.cycle(colors)
-    for p, age_samples in zip(poles, path.ages()):
-        c = colorcycle.next()
+    for i, (p, age_samples) in enumerate(zip(poles, path.ages())):
+        c = colors[i % len(colors)]
         age = np.linspace(1070, 1115, 1000)
         if p.age_type == 'gaussian':
             dist = st.norm.pdf(age, loc=p.age, scale=p.sigma_age)
@@ -192,10 +187,9 @@ def plot_synthetic_poles( ax=None, title=''):
 
     myax.gridlines()
 
-    colorcycle = itertools.cycle(colors)
     lons, lats, ages = path.compute_synthetic_poles(n=100)
     for i in range(len(poles)):
-        c = colorcycle.next()
+        c = colors[i % len(colors)]
         poles[i].plot(ax, color=c)
         myax.scatter(lons[:, i], lats[:, i], color=c,
                      transform=ccrs.PlateCarree())
@@ -220,10 +214,9 @@ def plot_changepoints( ax=None, title=''):
 
     xmin= 1.e10
     xmax=0.0
-    colorcycle = itertools.cycle( dist_colors_short )
     for i, change in enumerate(changepoints):
 
-        c = next(colorcycle)
+        c = dist_colors_short[i % len(dist_colors_short)]
 
         #plot histogram
         myax.hist(change, bins=30, normed=True, alpha=0.5, color=c, label='Changepoint %i'%(i))
@@ -273,7 +266,6 @@ def plot_plate_speeds( ax = None, title = ''):
 
     xmin = 1000.
     xmax = 0.
-    colorcycle = itertools.cycle( dist_colors_short )
     for i, (directions, rates) in enumerate(zip(euler_directions, euler_rates)):
 
         #comptute plate speeds
@@ -283,7 +275,7 @@ def plot_plate_speeds( ax = None, title = ''):
                 directions[j, 0], directions[j, 1], rates[j])
             speed_samples[j] = euler.speed_at_point(duluth)
 
-        c = next(colorcycle)
+        c = dist_colors_short[i % len(dist_colors_short)]
 
         #plot histogram
         myax.hist(speed_samples, bins=30, normed=True, alpha=0.5, color=c, label='%i - %i Ma'%(changepoints[i], changepoints[i+1]))
@@ -313,8 +305,7 @@ def plot_plate_speeds( ax = None, title = ''):
 def make_legend(ax, title):
     # Make a custom legend
     import textwrap
-    colorcycle = itertools.cycle(colors)
-    color_list = [ next(colorcycle) for p in pole_names]
+    color_list = [ colors[i % len(colors)] for i in range(len(pole_names))]
     legend_names = [ '\n'.join(textwrap.wrap(name, 35)) for name in pole_names]
     legend = ax.legend(color_list, legend_names, fontsize=11, loc='center',
                 frameon=False, framealpha=1.0, handler_map={str: LegendHandler()})
@@ -1,9 +1,167 @@
+import multiprocessing
+import os
+
 import numpy as np
 import pymc
 
 from . import poles
 from . import distributions
 from . import rotations
+from .rotations import njit
+
+try:
+    import cupy
+except ImportError:
+    cupy = None
+
+
+@njit(cache=True)
+def _pole_position(start_lon, start_lat, age, tpw_pole_angle, tpw_rate,
+                   lon_lats, rates, changepoints, start_age):
+    """
+    Compute the position of a pole of a given age, working directly
+    with cartesian 3-vectors. lon_lats is a (K,2) array of Euler pole
+    longitudes and latitudes, rates is a (K,) array of Euler pole rates
+    (deg/Myr), and changepoints is a (K,) array of changepoint ages
+    sorted from oldest to youngest, ending with present day.
+    """
+    d2r = rotations.d2r
+    r2d = rotations.r2d
+
+    # make a starting pole
+    colat = (90. - start_lat) * d2r
+    pole = np.array([np.sin(colat) * np.cos(start_lon * d2r),
+                     np.sin(colat) * np.sin(start_lon * d2r),
+                     np.cos(colat)])
+    time = start_age
+
+    # make a TPW pole, working in units of deg/Myr
+    if pole[2] > pole[0]:
+        great_circle_pole = np.array([0., pole[2], -pole[1]])
+    else:
+        great_circle_pole = np.array([pole[1], -pole[0], 0.])
+    great_circle_pole /= np.sqrt(np.sum(great_circle_pole * great_circle_pole))
+    TPW = rotations.rotate(great_circle_pole, pole, tpw_pole_angle) * tpw_rate
+
+    if rates.shape[0] == 0:
+        pole = rotations.rotate(pole, TPW, tpw_rate * (time - age))
+    else:
+        for i in range(rates.shape[0]):
+            # add tpw contribution
+            colat = (90. - lon_lats[i, 1]) * d2r
+            e = np.array([np.sin(colat) * np.cos(lon_lats[i, 0] * d2r),
+                          np.sin(colat) * np.sin(lon_lats[i, 0] * d2r),
+                          np.cos(colat)]) * rates[i] + TPW
+            rate = np.sqrt(np.sum(e * e))
+            c = changepoints[i]
+            if age < c:
+                pole = rotations.rotate(pole, e, rate * (time - c))
+                time = c
+            else:
+                pole = rotations.rotate(pole, e, rate * (time - age))
+                break
+
+    norm = np.sqrt(np.sum(pole * pole))
+    return np.array([np.arctan2(pole[1], pole[0]) * r2d,
+                     90. - np.arccos(pole[2] / norm) * r2d])
+
+
+def _tpw_pole_batch(pole, tpw_pole_angle):
+    """
+    Unit TPW poles for an (n,3) array of cartesian starting poles: a
+    pole on the great circle 90 degrees from each starting pole, rotated
+    about it by the corresponding entry of tpw_pole_angle.
+    """
+    use_x_axis = pole[:, 2] > pole[:, 0]
+    great_circle_pole = np.where(use_x_axis[:, np.newaxis],
+                                 np.cross(pole, [1., 0., 0.]),
+                                 np.cross(pole, [0., 0., 1.]))
+    great_circle_pole /= np.sqrt(np.sum(great_circle_pole * great_circle_pole,
+                                        axis=1))[:, np.newaxis]
+    return rotations.rotate_batch(great_circle_pole, pole, tpw_pole_angle)
+
+
+def _pole_position_batch(start, age, tpw_pole_angle, tpw_rate,
+                         lon_lats, rates, changepoints, start_age, xp=np):
+    """
+    Vectorized equivalent of the function made by
+    APWPath.generate_pole_position_fn, which evaluates n samples
+    of the model parameters at once, each at one or more ages.
+
+    Parameters
+    ----------
+    start : (n,2) array of starting pole longitudes and latitudes.
+    age : (n,) or (n,m) array of ages at which to evaluate the pole
+        positions, with each row belonging to one parameter sample.
+    tpw_pole_angle, tpw_rate : (n,) arrays of TPW parameters.
+    lon_lats : (n,K,2) array of Euler pole longitudes and latitudes.
+    rates : (n,K) array of Euler pole rates (deg/Myr).
+    changepoints : (n,K-1) array of changepoint ages.
+    start_age : age of the starting pole.
+    xp : array module used for the rotations along the paths. With
+        cupy, the per-sample setup is done on the host, and the
+        n*m rotations on the GPU.
+
+    Returns
+    -------
+    lon_lat : array of pole longitudes and latitudes, with shape
+        age.shape + (2,).
+    """
+    age = np.asarray(age, dtype=float)
+    n = age.shape[0]
+    n_euler_poles = rates.shape[1]
+
+    # Everything that only depends on the parameter samples is
+    # computed once per sample, and then repeated for each age.
+    pole = np.transpose(rotations.spherical_to_cartesian(
+        start[:, 0], start[:, 1], 1.))
+    m = age.size // n
+
+    # make the TPW poles, working in units of deg/Myr
+    TPW = _tpw_pole_batch(pole, tpw_pole_angle) * tpw_rate[:, np.newaxis]
+
+    if n_euler_poles > 0:
+        # add tpw contribution to each of the euler poles
+        euler_poles = np.moveaxis(rotations.spherical_to_cartesian(
+            lon_lats[:, :, 0], lon_lats[:, :, 1], rates), 0, -1)
+        euler_poles += TPW[:, np.newaxis, :]
+        euler_rates = np.sqrt(np.sum(euler_poles * euler_poles, axis=2))
+        # append present day to make then the same length
+        changepoints = np.concatenate((changepoints, np.zeros((n, 1))), axis=1)
+        changepoints = np.sort(changepoints, axis=1)[:, ::-1]
+
+    if xp is np:
+        rotate_batch = rotations.rotate_batch
+    else:
+        rotate_batch = rotations._rotate_batch
+        pole, TPW, tpw_rate, age = [xp.asarray(a) for a in (pole, TPW, tpw_rate, age)]
+        if n_euler_poles > 0:
+            euler_poles, euler_rates, changepoints = \
+                [xp.asarray(a) for a in (euler_poles, euler_rates, changepoints)]
+
+    ages = age.ravel()
+    pole = xp.repeat(pole, m, axis=0)
+
+    if n_euler_poles == 0:
+        angle = xp.repeat(tpw_rate, m) * (start_age - ages)
+        pole = rotate_batch(pole, xp.repeat(TPW, m, axis=0), angle)
+    else:
+        time = xp.full(n * m, float(start_age))
+        active = xp.ones(n * m, dtype=bool)
+        for k in range(n_euler_poles):
+            e = xp.repeat(euler_poles[:, k, :], m, axis=0)
+            c = xp.repeat(changepoints[:, k], m)
+            rate = xp.repeat(euler_rates[:, k], m)
+            # Samples which have already reached their age stop rotating
+            angle = xp.where(active, rate * (time - xp.maximum(c, ages)), 0.)
+            pole = rotate_batch(pole, e, angle)
+            active &= ages < c
+            time = c
+
+    if xp is not np:
+        pole = xp.asnumpy(pole)
+    lon, lat, _ = rotations.cartesian_to_spherical(pole)
+    return np.reshape(np.transpose([lon, lat]), age.shape + (2,))
 
 
 class APWPath(object):
@@ -16,66 +174,75 @@ class APWPath(object):
         self._poles = paleomagnetic_pole_list
         self.n_euler_rotations = n_euler_poles
 
-        age_list = [p.age for p in self._poles]
-        self._start_age = max(age_list)
-        self._start_pole = self._poles[np.argmax(age_list)]
+        # Keep the pole properties in flat arrays, rather than
+        # looking them up on the pole objects each time they are used
+        self._pole_lons = np.array([p.longitude for p in self._poles])
+        self._pole_lats = np.array([p.latitude for p in self._poles])
+        self._pole_ages = np.array([p.age for p in self._poles], dtype=float)
+        self._pole_kappas = np.array(
+            [np.nan if p.angular_error is None else
+             poles.kappa_from_two_sigma(p.angular_error) for p in self._poles])
+        self._pole_age_types = [p.age_type for p in self._poles]
+
+        self._start_index = np.argmax(self._pole_ages)
+        self._start_age = self._pole_ages[self._start_index]
 
         self._pole_position_fn = APWPath.generate_pole_position_fn(
             n_euler_poles, self._start_age)
         self.dbname = self._name + '.pickle'
         self.model_vars = None
         self.mcmc = None
+        self._chain_traces = None
+        self._trace_length = None
+        self._thinned_traces = {}
 
     @staticmethod
     def generate_pole_position_fn(n_euler_poles, start_age):
 
-        def pole_position(start, age, tpw_pole_angle, tpw_rate, *args):
-            if len(args) != max( (n_euler_poles * 3 - 1), 0):
+        n_args = max((n_euler_poles * 3 - 1), 0)
+        start_age = float(start_age)
+        # With a single Euler pole there is only the present day
+        # changepoint, and with none there are no Euler poles at all,
+        # so those arrays do not depend on the arguments.
+        no_lon_lats = np.empty((0, 2))
+        no_rates = np.empty(0)
+        present_day = np.zeros(1)
+
+        def check_args(args):
+            if len(args) != n_args:
                 raise Exception("Unexpected number of euler poles/changepoints: expected %i, got %i"%(n_euler_poles*3-1, len(args)))
 
-            # Parse the variable length arguments into euler poles and
-            # changepoints
-            lon_lats = args[0:n_euler_poles]
-            rates = args[n_euler_poles:2 * n_euler_poles]
-            changepoints = list(args[2 * n_euler_poles:])
-            # append present day to make then the same length
-            changepoints.append(0.0)
-            changepoints = np.sort(changepoints)[::-1]
-            euler_poles = [poles.EulerPole(ll[0], ll[1], r)
-                           for ll, r in zip(lon_lats, rates)]
-
-            # make a starting pole
-            pole = poles.PaleomagneticPole(start[0], start[1], age=age)
-            time = start_age
-
-            # make a TPW pole
-            test_1 = np.array([0.,0.,1.])
-            test_2 = np.array([1.,0.,0.])
-            if np.dot(pole._pole, test_1) > np.dot(pole._pole, test_2):
-                great_circle_pole = np.cross(pole._pole, test_2)
-            else:
-                great_circle_pole = np.cross(pole._pole, test_1)
-            lon, lat, _ = rotations.cartesian_to_spherical(great_circle_pole)
-            TPW = poles.EulerPole(lon[0], lat[0], tpw_rate)
-            TPW.rotate(pole, tpw_pole_angle)
+        if n_euler_poles == 0:
+            def pole_position(start, age, tpw_pole_angle, tpw_rate, *args):
+                check_args(args)
+                return _pole_position(float(start[0]), float(start[1]), float(age),
+                                      float(tpw_pole_angle), float(tpw_rate),
+                                      no_lon_lats, no_rates, present_day, start_age)
+
+        elif n_euler_poles == 1:
+            def pole_position(start, age, tpw_pole_angle, tpw_rate, *args):
+                check_args(args)
+                lon_lats = np.array([args[0]], dtype=float)
+                rates = np.array([args[1]], dtype=float)
+                return _pole_position(float(start[0]), float(start[1]), float(age),
+                                      float(tpw_pole_angle), float(tpw_rate),
+                                      lon_lats, rates, present_day, start_age)
 
-            if n_euler_poles == 0:
-                pole.rotate(TPW, TPW.rate * (time-age))
-            else:
-                for e, c in zip(euler_poles, changepoints):
-                    # add tpw contribution
-                    e2 = e.copy()
-                    e2.add(TPW)
-                    if age < c:
-                        angle = e2.rate * (time - c)
-                        pole.rotate(e2, angle)
-                        time = c
-                    else:
-                        angle = e2.rate * (time - age)
-                        pole.rotate(e2, angle)
-                        break
-            lon_lat = np.array([pole.longitude, pole.latitude])
-            return lon_lat
+        else:
+            def pole_position(start, age, tpw_pole_angle, tpw_rate, *args):
+                check_args(args)
+                # Parse the variable length arguments into euler poles and
+                # changepoints
+                lon_lats = np.array(args[0:n_euler_poles], dtype=float)
+                rates = np.array(args[n_euler_poles:2 * n_euler_poles], dtype=float)
+                # append present day to make then the same length. Sorting
+                # a handful of floats is quicker in Python than in NumPy.
+                changepoints = [float(c) for c in args[2 * n_euler_poles:]]
+                changepoints.append(0.0)
+                changepoints = np.array(sorted(changepoints, reverse=True))
+                return _pole_position(float(start[0]), float(start[1]), float(age),
+                                      float(tpw_pole_angle), float(tpw_rate),
+                                      lon_lats, rates, changepoints, start_age)
 
         return pole_position
 
@@ -109,6 +276,12 @@ class APWPath(object):
         assert rate_scale > 0.0, "rate_scale must be a positive number."
         assert tpw_rate_scale == None or tpw_rate_scale > 0.0
         assert watson_concentration <= 0.0, "Nonnegative Watson concentration parameters are not supported."
+        # Keep the arguments so that the model can be rebuilt
+        # in other processes by sample_mcmc_parallel
+        self._model_kwargs = dict(site_lon_lat=site_lon_lat,
+                                  watson_concentration=watson_concentration,
+                                  rate_scale=rate_scale,
+                                  tpw_rate_scale=tpw_rate_scale)
         if tpw_rate_scale is None:
             self.include_tpw = False
         else:
@@ -119,8 +292,9 @@ class APWPath(object):
 
         start = distributions.VonMisesFisher('start',
                                              lon_lat=(
-                                                 self._start_pole.longitude, self._start_pole.latitude),
-                                             kappa=poles.kappa_from_two_sigma(self._start_pole.angular_error),
+                                                 self._pole_lons[self._start_index],
+                                                 self._pole_lats[self._start_index]),
+                                             kappa=self._pole_kappas[self._start_index],
                                              value=(0.,0.), observed=False)
 
         model_vars.append(start)
@@ -148,19 +322,18 @@ class APWPath(object):
             args.append(rate)
 
         # Make changepoint random variables
-        age_list = [p.age for p in self._poles]
         for i in range(self.n_euler_rotations - 1):
             changepoint = pymc.Uniform(
-                'changepoint_' + str(i), min(age_list), max(age_list))
+                'changepoint_' + str(i), self._pole_ages.min(), self._pole_ages.max())
             model_vars.append(changepoint)
             args.append(changepoint)
 
         # Make observed random variables
         for i, p in enumerate(self._poles):
-            if p.age_type == 'gaussian':
+            if self._pole_age_types[i] == 'gaussian':
                 pole_age = pymc.Normal(
-                    'a_' + str(i), mu=p.age, tau=np.power(p.sigma_age, -2.))
-            elif p.age_type == 'uniform':
+                    'a_' + str(i), mu=self._pole_ages[i], tau=np.power(p.sigma_age, -2.))
+            elif self._pole_age_types[i] == 'uniform':
                 pole_age = pymc.Uniform(
                     'a_' + str(i), lower=p.sigma_age[0], upper=p.sigma_age[1])
 
@@ -180,10 +353,9 @@ class APWPath(object):
 
             observed_pole = distributions.VonMisesFisher('p_' + str(i),
                                                          lon_lat,
-                                                         kappa=poles.kappa_from_two_sigma(
-                                                             p.angular_error),
+                                                         kappa=self._pole_kappas[i],
                                                          observed=True,
-                                                         value=(p.longitude, p.latitude))
+                                                         value=(self._pole_lons[i], self._pole_lats[i]))
             model_vars.append(pole_age)
             model_vars.append(lon_lat)
             model_vars.append(observed_pole)
@@ -202,6 +374,67 @@ class APWPath(object):
     def load_mcmc(self):
         self.mcmc = pymc.MCMC(self.model_vars, db='pickle', dbname=self.dbname)
         self.mcmc.db = pymc.database.pickle.load(self.dbname)
+        self._chain_traces = None
+        self._trace_length = self.mcmc.db.trace('start').length()
+        self._thinned_traces = {}
+
+    def sample_mcmc_parallel(self, nsample=10000, n_chains=None):
+        """
+        Run n_chains independent MCMC chains in separate processes,
+        each of length nsample/n_chains, and load the combined traces.
+        Each chain is written to its own database (see _chain_dbname).
+        n_chains defaults to the number of CPUs, but no more than nsample.
+        """
+        if self.model_vars is None:
+            raise Exception("No model has been created")
+        if n_chains is None:
+            n_chains = min(multiprocessing.cpu_count(), nsample)
+        if n_chains < 1 or nsample < n_chains:
+            raise Exception("Need at least one sample for each of the chains")
+
+        # pymc MCMC objects cannot be pickled, so each worker rebuilds
+        # the model from scratch. Give every chain its own seed, as
+        # forked workers would otherwise share the random state.
+        seeds = np.random.randint(0, 2**31 - 1, size=n_chains)
+        jobs = [(self._name, self._poles, self.n_euler_rotations,
+                 self._model_kwargs, self._chain_dbname(rank),
+                 int(nsample / n_chains), seeds[rank])
+                for rank in range(n_chains)]
+        pool = multiprocessing.Pool(n_chains)
+        try:
+            pool.map(_sample_chain, jobs)
+        finally:
+            pool.close()
+            pool.join()
+        self.load_mcmc_chains(n_chains)
+
+    def load_mcmc_chains(self, n_chains):
+        """
+        Load the databases written by sample_mcmc_parallel, concatenating
+        the traces of all the chains. The trace accessors (euler_directions,
+        euler_rates, changepoints, ages, ...) then return the samples of
+        every chain.
+        """
+        dbs = [pymc.database.pickle.load(self._chain_dbname(rank))
+               for rank in range(n_chains)]
+        self.mcmc = pymc.MCMC(self.model_vars, db='pickle',
+                              dbname=self._chain_dbname(0))
+        self.mcmc.db = dbs[0]
+        self._chain_traces = dict(
+            (name, np.concatenate([db.trace(name)[:] for db in dbs]))
+            for name in dbs[0].trace_names[-1])
+        self._trace_length = len(self._chain_traces['start'])
+        self._thinned_traces = {}
+
+    def _chain_dbname(self, rank):
+        return os.path.splitext(self.dbname)[0] + '.' + str(rank) + '.pickle'
+
+    def _trace(self, name):
+        if self._chain_traces is not None:
+            return self._chain_traces[name]
+        if self.mcmc is None or self.mcmc.db is None:
+            raise Exception("No database loaded")
+        return self.mcmc.db.trace(name)[:]
 
     def find_MAP(self):
         self.MAP = pymc.MAP(self.model_vars)
@@ -210,169 +443,70 @@ class APWPath(object):
         return self.logp_at_max
 
     def tpw_poles(self):
-        if self.mcmc.db is None:
-            raise Exception("No database loaded")
         if self.include_tpw == False:
             return []
 
-        tpw_pole_angle_samples = self.mcmc.db.trace('tpw_pole_angle')[:]
-        start_samples = self.mcmc.db.trace('start')[:]
-        tpw_pole_samples = np.empty_like(start_samples)
-        index = 0
-        for start, tpw_pole_angle in zip(start_samples, tpw_pole_angle_samples):
-            test_1 = np.array([0.,0.,1.])
-            test_2 = np.array([1.,0.,0.])
-            pole = poles.Pole(start[0], start[1], 1.0)
-            if np.dot(pole._pole, test_1) > np.dot(pole._pole, test_2):
-                great_circle_pole = np.cross(pole._pole, test_2)
-            else:
-                great_circle_pole = np.cross(pole._pole, test_1)
-            lon, lat, _ = rotations.cartesian_to_spherical(great_circle_pole)
-            TPW = poles.Pole(lon[0], lat[0], 1.0)
-            TPW.rotate(pole, tpw_pole_angle)
-            tpw_pole_samples[index, :] = [TPW.longitude, TPW.latitude]
-            index+=1
+        tpw_pole_angle_samples = self._trace('tpw_pole_angle')
+        start_samples = self._trace('start')
+        pole = np.transpose(rotations.spherical_to_cartesian(
+            start_samples[:, 0], start_samples[:, 1], 1.))
+        TPW = _tpw_pole_batch(pole, tpw_pole_angle_samples)
+        lon, lat, _ = rotations.cartesian_to_spherical(TPW)
+        tpw_pole_samples = np.transpose([lon, lat])
 
         return tpw_pole_samples
 
     def tpw_rates(self):
-        if self.mcmc.db is None:
-            raise Exception("No database loaded")
         if self.include_tpw == False:
             return []
 
-        rate_samples = self.mcmc.db.trace('tpw_rate')[:]
+        rate_samples = self._trace('tpw_rate')
         return rate_samples
 
     def euler_directions(self):
-        if self.mcmc.db is None:
-            raise Exception("No database loaded")
         direction_samples = []
         for i in range(self.n_euler_rotations):
-            samples = self.mcmc.db.trace('euler_' + str(i))[:]
+            samples = self._trace('euler_' + str(i))
             samples[:,0] = rotations.clamp_longitude( samples[:,0])
             direction_samples.append(samples)
         return direction_samples
 
     def euler_rates(self):
-        if self.mcmc.db is None:
-            raise Exception("No database loaded")
         rate_samples = []
         for i in range(self.n_euler_rotations):
-            rate_samples.append(self.mcmc.db.trace('rate_' + str(i))[:])
+            rate_samples.append(self._trace('rate_' + str(i)))
         return rate_samples
 
     def changepoints(self):
-        if self.mcmc.db is None:
-            raise Exception("No database loaded")
         changepoint_samples = []
         for i in range(self.n_euler_rotations - 1):
             changepoint_samples.append(
-                self.mcmc.db.trace('changepoint_' + str(i))[:])
+                self._trace('changepoint_' + str(i)))
         return changepoint_samples
 
     def ages(self):
-        if self.mcmc.db is None:
-            raise Exception("No database loaded")
         age_samples = []
         for i in range(len(self._poles)):
-            age_samples.append(self.mcmc.db.trace('a_' + str(i))[:])
+            age_samples.append(self._trace('a_' + str(i)))
         return age_samples
 
     def compute_synthetic_poles(self, n=100):
 
-        assert n <= len(self.mcmc.db.trace('start')[
-                        :]) and n >= 1, "Number of requested samples is not in allowable range"
-        interval = max(1, int(len(self.mcmc.db.trace('start')[:]) / n))
-        assert(interval > 0)
-
-        n_poles = len(self._poles)
-        lats = np.zeros((n, n_poles))
-        lons = np.zeros((n, n_poles))
-        ages = np.zeros((n, n_poles))
-
-        index = 0
-        for i in range(n):
-
-            # begin args list with placeholder for age
-            if self.include_tpw:
-                args = [self.mcmc.db.trace('start')[index], 0.0, self.mcmc.db.trace('tpw_pole_angle')[index], self.mcmc.db.trace('tpw_rate')[index]]
-            else:
-                args = [self.mcmc.db.trace('start')[index], 0.0, 0.0, 0.0]
-
-            # add the euler pole direction arguments
-            for j in range(self.n_euler_rotations):
-                euler = self.mcmc.db.trace('euler_' + str(j))[index]
-                args.append(euler)
-
-            # add the euler pole rate arguments
-            for j in range(self.n_euler_rotations):
-                rate = self.mcmc.db.trace('rate_' + str(j))[index]
-                args.append(rate)
-
-            # add the switchpoint arguments
-            for j in range(self.n_euler_rotations - 1):
-                changepoint = self.mcmc.db.trace('changepoint_' + str(j))[index]
-                args.append(changepoint)
-
-            for j, a in enumerate(self._poles):
-                # put in the relevant age
-                args[1] = self.mcmc.db.trace('a_' + str(j))[index]
-                lon_lat = self._pole_position_fn(*args)
-                lons[i, j] = lon_lat[0]
-                lats[i, j] = lon_lat[1]
-                ages[i, j] = args[1]
-
-            index += interval
+        n_poles = len(self._pole_ages)
+        parameters = self._thinned_parameters(n)
+        ages = np.transpose([self._thinned_trace('a_' + str(j), n)
+                             for j in range(n_poles)])
 
+        lons, lats = self._pole_positions(parameters, ages)
         return lons, lats, ages
 
-    def compute_synthetic_paths(self, n=100):
-
-        assert n <= len(self.mcmc.db.trace('start')[
-                        :]) and n >= 1, "Number of requested samples is not in allowable range"
-        interval = max(1, int(len(self.mcmc.db.trace('start')[:]) / n))
-        assert(interval > 0)
+    def compute_synthetic_paths(self, n=100, use_gpu=False):
 
         n_segments = 100
-        pathlats = np.zeros((n, n_segments))
-        pathlons = np.zeros((n, n_segments))
-        age_list = [p.age for p in self._poles]
-        ages = np.linspace(max(age_list), min(age_list), n_segments)
-
-        index = 0
-        for i in range(n):
-            # begin args list with placeholder for age
-            if self.include_tpw:
-                args = [self.mcmc.db.trace('start')[index], 0.0, self.mcmc.db.trace('tpw_pole_angle')[index], self.mcmc.db.trace('tpw_rate')[index]]
-            else:
-                args = [self.mcmc.db.trace('start')[index], 0.0, 0.0, 0.0]
-
-            # add the euler pole direction arguments
-            for j in range(self.n_euler_rotations):
-                euler = self.mcmc.db.trace('euler_' + str(j))[index]
-                args.append(euler)
-
-            # add the euler pole rate arguments
-            for j in range(self.n_euler_rotations):
-                rate = self.mcmc.db.trace('rate_' + str(j))[index]
-                args.append(rate)
-
-            # add the switchpoint arguments
-            for j in range(self.n_euler_rotations - 1):
-                changepoint = self.mcmc.db.trace('changepoint_' + str(j))[index]
-                args.append(changepoint)
-
-            for j, a in enumerate(ages):
-                args[1] = a  # put in the relevant age
-                lon_lat = self._pole_position_fn(*args)
-                pathlons[i, j] = lon_lat[0]
-                pathlats[i, j] = lon_lat[1]
-            index += interval
-
-        return pathlons, pathlats
+        ages = np.linspace(self._pole_ages.max(), self._pole_ages.min(), n_segments)
+        return self.compute_poles_on_path(ages, n_poles=n, use_gpu=use_gpu)
 
-    def compute_poles_on_path(self, ages, n_poles=100):
+    def compute_poles_on_path(self, ages, n_poles=100, use_gpu=False):
         """
         For a given suite of paths, return the positions predicted on the paths
         by the inversion for a given list of ages.
@@ -383,49 +517,92 @@ class APWPath(object):
         ages : list of ages along the path in Ma (e.g. [10,30,50])
         n_poles : number of paths to sample and the resultant number of poles that
             will be returned for a given age.
+        use_gpu : if True, do the rotations along the paths on the GPU
+            with CuPy, which must be installed.
 
         Returns
         -------
         pathlons, pathlats: an array of pathlons and an array pathlats with one
             column for each age
         """
-        assert n_poles <= len(self.mcmc.db.trace('start')[
-                        :]) and n_poles >= 1, "Number of requested samples is not in allowable range"
-        interval = max(1, int(len(self.mcmc.db.trace('start')[:]) / n_poles))
-        assert(interval > 0)
-
-        n_ages = len(ages)
-        pathlats = np.zeros((n_poles, n_ages))
-        pathlons = np.zeros((n_poles, n_ages))
-
-        index = 0
-        for i in range(n_poles):
-            # begin args list with placeholder for age
-            if self.include_tpw:
-                args = [self.mcmc.db.trace('start')[index], 0.0, self.mcmc.db.trace('tpw_pole_angle')[index], self.mcmc.db.trace('tpw_rate')[index]]
-            else:
-                args = [self.mcmc.db.trace('start')[index], 0.0, 0.0, 0.0]
-
-            # add the euler pole direction arguments
-            for j in range(self.n_euler_rotations):
-                euler = self.mcmc.db.trace('euler_' + str(j))[index]
-                args.append(euler)
-
-            # add the euler pole rate arguments
-            for j in range(self.n_euler_rotations):
-                rate = self.mcmc.db.trace('rate_' + str(j))[index]
-                args.append(rate)
-
-            # add the switchpoint arguments
-            for j in range(self.n_euler_rotations - 1):
-                changepoint = self.mcmc.db.trace('changepoint_' + str(j))[index]
-                args.append(changepoint)
-
-            for j, a in enumerate(ages):
-                args[1] = a  # put in the relevant age
-                lon_lat = self._pole_position_fn(*args)
-                pathlons[i, j] = lon_lat[0]
-                pathlats[i, j] = lon_lat[1]
-            index += interval
-
+        parameters = self._thinned_parameters(n_poles)
+        ages = np.tile(np.asarray(ages, dtype=float), (n_poles, 1))
+        pathlons, pathlats = self._pole_positions(parameters, ages, use_gpu)
         return pathlons, pathlats
+
+    def _pole_positions(self, parameters, ages, use_gpu=False):
+        """
+        Evaluate the pole positions for each of the n parameter samples
+        from _thinned_parameters at the ages in the corresponding row of
+        the (n,m) array ages, in a single batched call. Returns (n,m)
+        arrays of longitudes and latitudes.
+        """
+        if use_gpu and cupy is None:
+            raise Exception("CuPy is required for use_gpu=True")
+        xp = cupy if use_gpu else np
+        start, tpw_pole_angle, tpw_rate, lon_lats, rates, changepoints = parameters
+        lon_lat = _pole_position_batch(start, ages, tpw_pole_angle, tpw_rate,
+                                       lon_lats, rates, changepoints, self._start_age,
+                                       xp=xp)
+        return lon_lat[..., 0], lon_lat[..., 1]
+
+    def _sample_interval(self, n):
+        """
+        Spacing between the n samples drawn evenly from the MCMC traces.
+        """
+        if self._trace_length is None:
+            self._trace_length = len(self._trace('start'))
+        n_samples = self._trace_length
+        assert n <= n_samples and n >= 1, "Number of requested samples is not in allowable range"
+        return max(1, int(n_samples / n))
+
+    def _thinned_trace(self, name, n):
+        """
+        n samples drawn evenly from the MCMC trace of the given name.
+        These are kept after the first request, so that each trace is
+        only read and strided once for a given n.
+        """
+        key = (name, n)
+        if key not in self._thinned_traces:
+            interval = self._sample_interval(n)
+            self._thinned_traces[key] = self._trace(name)[::interval][:n]
+        return self._thinned_traces[key]
+
+    def _thinned_parameters(self, n):
+        """
+        Collect n evenly spaced samples of the model parameters from
+        the MCMC traces as arrays suitable for _pole_position_batch.
+        """
+        trace = self._thinned_trace
+        start = trace('start', n)
+        if self.include_tpw:
+            tpw_pole_angle = trace('tpw_pole_angle', n)
+            tpw_rate = trace('tpw_rate', n)
+        else:
+            tpw_pole_angle = np.zeros(n)
+            tpw_rate = np.zeros(n)
+
+        lon_lats = np.empty((n, self.n_euler_rotations, 2))
+        rates = np.empty((n, self.n_euler_rotations))
+        changepoints = np.empty((n, max(self.n_euler_rotations - 1, 0)))
+        for j in range(self.n_euler_rotations):
+            lon_lats[:, j, :] = trace('euler_' + str(j), n)
+            rates[:, j] = trace('rate_' + str(j), n)
+        for j in range(self.n_euler_rotations - 1):
+            changepoints[:, j] = trace('changepoint_' + str(j), n)
+
+        return start, tpw_pole_angle, tpw_rate, lon_lats, rates, changepoints
+
+
+def _sample_chain(args):
+    """
+    Worker for APWPath.sample_mcmc_parallel, which builds a fresh
+    copy of the model and samples a single chain into dbname.
+    """
+    name, pole_list, n_euler_poles, model_kwargs, dbname, nsample, seed = args
+    np.random.seed(seed)
+    path = APWPath(name, pole_list, n_euler_poles)
+    path.dbname = dbname
+    path.create_model(**model_kwargs)
+    path.sample_mcmc(nsample)
+    return dbname
@@ -1,3 +1,6 @@
+import functools
+import math
+
 import numpy as np
 import scipy.stats as st
 import scipy.special as sp
@@ -5,78 +8,149 @@ import scipy.special as sp
 import pymc
 from pymc.Node import ZeroProbability
 
+from . import rotations
+from .rotations import njit
+
 d2r = np.pi / 180.
 r2d = 180. / np.pi
 eps = 1.e-6
 
 
-def vmf_random(lon_lat, kappa):
-    # make the appropriate euler rotation matrix
-    alpha = 0.
-    beta = np.pi / 2. - lon_lat[1] * d2r
-    gamma = lon_lat[0] * d2r
-    rot_alpha = np.array([[np.cos(alpha), -np.sin(alpha), 0.],
-                          [np.sin(alpha), np.cos(alpha), 0.],
-                          [0., 0., 1.]])
-    rot_beta = np.array([[np.cos(beta), 0., np.sin(beta)],
-                         [0., 1., 0.],
-                         [-np.sin(beta), 0., np.cos(beta)]])
-    rot_gamma = np.array([[np.cos(gamma), -np.sin(gamma), 0.],
-                          [np.sin(gamma), np.cos(gamma), 0.],
-                          [0., 0., 1.]])
-    rotation_matrix = np.dot(rot_gamma, np.dot(rot_beta, rot_alpha))
-
-    def cartesian_sample_generator():
-        # Generate samples around the z-axis, then rotate
-        # to the appropriate position using euler angles
-
-        # z-coordinate is determined by inversion of the cumulative
-        # distribution function for that coordinate.
-        zeta = st.uniform.rvs(loc=0., scale=1.)
-        if kappa < eps:
-            z = 2. * zeta - 1.
-        else:
-            z = 1. + 1. / kappa * \
-                np.log(zeta + (1. - zeta) * np.exp(-2. * kappa))
-
-        # x and y coordinates can be determined by a
-        # uniform distribution in longitude.
-        phi = st.uniform.rvs(loc=0., scale=2. * np.pi)
-        x = np.sqrt(1. - z * z) * np.cos(phi)
-        y = np.sqrt(1. - z * z) * np.sin(phi)
-
-        # Rotate the samples to have the correct mean direction
-        unrotated_samples = np.array([x, y, z])
-        samples = np.transpose(np.dot(rotation_matrix, unrotated_samples))
-        return samples
-
-    s = cartesian_sample_generator()
-    lon_lat = np.array([np.arctan2(s[1], s[0]), np.pi /
-                        2. - np.arccos(s[2] / np.sqrt(np.dot(s, s)))]) * r2d
+@functools.lru_cache(maxsize=128)
+def _rotation_matrix(lon, lat):
+    # make the appropriate euler rotation matrix, taking the
+    # z-axis to the direction (lon, lat). The first rotation
+    # about the z axis is always zero, so the closed form
+    # product of the remaining two is used.
+    beta = np.pi / 2. - lat * d2r
+    gamma = lon * d2r
+    rotation_matrix = rotations._euler_matrix_ab(beta, gamma)
+    # The cached matrix is shared between calls
+    rotation_matrix.flags.writeable = False
+    return rotation_matrix
+
+
+@njit(cache=True, nogil=True)
+def _vmf_sample_point(zeta, phi, kappa, exp_m2k, rotation_matrix):
+    """
+    Turn a pair of uniform draws, zeta on [0,1) and phi on [0,2pi),
+    into a single VonMisesFisher distributed longitude and latitude.
+    exp_m2k is exp(-2 kappa), which is computed once by the caller.
+    """
+    if kappa < eps:
+        z = 2. * zeta - 1.
+    else:
+        z = 1. + 1. / kappa * math.log(zeta + (1. - zeta) * exp_m2k)
+    r = math.sqrt(1. - z * z)
+    x = r * math.cos(phi)
+    y = r * math.sin(phi)
+
+    m = rotation_matrix
+    sx = m[0, 0] * x + m[0, 1] * y + m[0, 2] * z
+    sy = m[1, 0] * x + m[1, 1] * y + m[1, 2] * z
+    sz = m[2, 0] * x + m[2, 1] * y + m[2, 2] * z
+    norm = math.sqrt(sx * sx + sy * sy + sz * sz)
+    return np.array([math.atan2(sy, sx) * r2d,
+                     (np.pi / 2. - math.acos(sz / norm)) * r2d])
+
+
+def vmf_random(lon_lat, kappa, size=None):
+    # The rotation matrix only depends on the mean direction,
+    # so it is cached for repeated draws around the same one.
+    rotation_matrix = _rotation_matrix(float(lon_lat[0]), float(lon_lat[1]))
+    # Likewise exp(-2 kappa) is shared by all of the draws
+    kappa = float(kappa)
+    exp_m2k = math.exp(-2. * kappa)
+
+    # Single draws (as made by the MCMC sampler) use the compiled kernel
+    if size is None:
+        zeta = np.random.uniform(0., 1.)
+        phi = np.random.uniform(0., 2. * np.pi)
+        return _vmf_sample_point(zeta, phi, kappa, exp_m2k, rotation_matrix)
+
+    # Generate samples around the z-axis, then rotate
+    # to the appropriate position using euler angles
+
+    # z-coordinate is determined by inversion of the cumulative
+    # distribution function for that coordinate.
+    zeta = np.random.uniform(0., 1., size=size)
+    if kappa < eps:
+        z = 2. * zeta - 1.
+    else:
+        z = 1. + 1. / kappa * np.log(zeta + (1. - zeta) * exp_m2k)
+
+    # x and y coordinates can be determined by a
+    # uniform distribution in longitude.
+    phi = np.random.uniform(0., 2. * np.pi, size=size)
+    r = np.sqrt(1. - z * z)
+    unrotated_samples = np.stack((r * np.cos(phi), r * np.sin(phi), z), axis=-1)
+
+    # Rotate the samples to have the correct mean direction
+    s = np.dot(unrotated_samples, rotation_matrix.T)
+    norm = np.sqrt(np.sum(s * s, axis=-1))
+    lon_lat = np.stack((np.arctan2(s[..., 1], s[..., 0]),
+                        np.pi / 2. - np.arccos(s[..., 2] / norm)), axis=-1) * r2d
     return lon_lat
 
 
+@functools.lru_cache(maxsize=128)
+def _vmf_log_normalization(kappa):
+    # The concentration of a given VonMisesFisher node is usually
+    # fixed (e.g. from a pole's angular error), so the log of the
+    # normalization constant is only computed once per kappa.
+    return math.log(-kappa / (2. * math.pi * math.expm1(-2. * kappa)))
+
+
+@njit(cache=True, nogil=True)
+def _vmf_logp_point(lon, lat, mu_lon, mu_lat, kappa, log_normalization):
+    lat = lat * d2r
+    mu_lat = mu_lat * d2r
+    cos_dist = math.cos(lat) * math.cos(mu_lat) * math.cos((lon - mu_lon) * d2r) + \
+        math.sin(lat) * math.sin(mu_lat)
+    return log_normalization + kappa * (cos_dist - 1.)
+
+
+@njit(cache=True, nogil=True)
+def _vmf_cos_dist_sum(x, mu_lon, mu_lat):
+    # Sum over each row of x of the cosine of its angular
+    # distance from the mean direction
+    mu_lat = mu_lat * d2r
+    cos_mu_lat = math.cos(mu_lat)
+    sin_mu_lat = math.sin(mu_lat)
+    lat = x[:, 1] * d2r
+    cos_dist = np.cos(lat) * cos_mu_lat * np.cos((x[:, 0] - mu_lon) * d2r) + \
+        np.sin(lat) * sin_mu_lat
+    return np.sum(cos_dist)
+
+
 def vmf_logp(x, lon_lat, kappa):
 
-    if x[1] < -90. or x[1] > 90.:
+    # A single direction is by far the most common case, so
+    # handle it with a scalar kernel rather than small arrays.
+    if np.ndim(x) == 1:
+        if x[1] < -90. or x[1] > 90.:
+            raise ZeroProbability
+            return -np.inf
+
+        if kappa < eps:
+            return np.log(1. / 4. / np.pi)
+
+        kappa = float(kappa)
+        return _vmf_logp_point(float(x[0]), float(x[1]),
+                               float(lon_lat[0]), float(lon_lat[1]),
+                               kappa, _vmf_log_normalization(kappa))
+
+    xp = np.asarray(x, dtype=float)
+    if np.any(xp[:, 1] < -90.) or np.any(xp[:, 1] > 90.):
         raise ZeroProbability
         return -np.inf
 
+    n = xp.shape[0]
     if kappa < eps:
-        return np.log(1. / 4. / np.pi)
+        return n * np.log(1. / 4. / np.pi)
 
-    mu = np.array([np.cos(lon_lat[1] * d2r) * np.cos(lon_lat[0] * d2r),
-                   np.cos(lon_lat[1] * d2r) * np.sin(lon_lat[0] * d2r),
-                   np.sin(lon_lat[1] * d2r)])
-    test_point = np.transpose(np.array([np.cos(x[1] * d2r) * np.cos(x[0] * d2r),
-                                        np.cos(x[1] * d2r) *
-                                        np.sin(x[0] * d2r),
-                                        np.sin(x[1] * d2r)]))
-
-    logp_elem = np.log( -kappa / ( 2. * np.pi * np.expm1(-2. * kappa)) ) + \
-        kappa * (np.dot(test_point, mu) - 1.)
-
-    logp = logp_elem.sum()
+    cos_dist = _vmf_cos_dist_sum(xp, float(lon_lat[0]), float(lon_lat[1]))
+    logp = n * _vmf_log_normalization(float(kappa)) + kappa * (cos_dist - n)
     return logp
 
 VonMisesFisher = pymc.stochastic_from_dist('von_mises_fisher',
@@ -87,16 +161,7 @@ VonMisesFisher = pymc.stochastic_from_dist('von_mises_fisher',
 
 
 def spherical_beta_random(lon_lat, alpha):
-    # make the appropriate euler rotation matrix
-    beta = np.pi / 2. - lon_lat[1] * d2r
-    gamma = lon_lat[0] * d2r
-    rot_beta = np.array([[np.cos(beta), 0., np.sin(beta)],
-                         [0., 1., 0.],
-                         [-np.sin(beta), 0., np.cos(beta)]])
-    rot_gamma = np.array([[np.cos(gamma), -np.sin(gamma), 0.],
-                          [np.sin(gamma), np.cos(gamma), 0.],
-                          [0., 0., 1.]])
-    rotation_matrix = np.dot(rot_gamma, rot_beta)
+    rotation_matrix = _rotation_matrix(float(lon_lat[0]), float(lon_lat[1]))
 
     # Generate samples around the z-axis, then rotate
     # to the appropriate position using euler angles
@@ -154,16 +219,7 @@ SphericalBeta = pymc.stochastic_from_dist('watson',
 
 
 def watson_girdle_random(lon_lat, kappa):
-    # make the appropriate euler rotation matrix
-    beta = np.pi / 2. - lon_lat[1] * d2r
-    gamma = lon_lat[0] * d2r
-    rot_beta = np.array([[np.cos(beta), 0., np.sin(beta)],
-                         [0., 1., 0.],
-                         [-np.sin(beta), 0., np.cos(beta)]])
-    rot_gamma = np.array([[np.cos(gamma), -np.sin(gamma), 0.],
-                          [np.sin(gamma), np.cos(gamma), 0.],
-                          [0., 0., 1.]])
-    rotation_matrix = np.dot(rot_gamma, rot_beta)
+    rotation_matrix = _rotation_matrix(float(lon_lat[0]), float(lon_lat[1]))
 
     # Generate samples around the z-axis, then rotate
     # to the appropriate position using euler angles
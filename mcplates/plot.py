@@ -5,10 +5,11 @@ import numpy.ma as ma
 
 import matplotlib.pyplot as plt
 from matplotlib.colors import LinearSegmentedColormap
+from matplotlib.collections import LineCollection
 
 import cartopy.crs as ccrs
 
-from .poles import Pole
+from . import rotations
 
 cmap_blue = plt.get_cmap('Blues')
 cmap_red = plt.get_cmap('Reds')
@@ -144,16 +145,31 @@ def plot_continent( ax, name, rotation_pole=None, angle=0.,  **kwargs):
             lon = lon if lon < 180. else lon-360.
             lon_lat.append( [lon,lat] )
 
-    # If the user has included an Euler rotation, do that.
+    lon_lat = np.array(lon_lat)
+
+    # If the user has included an Euler rotation, do that,
+    # rotating all of the points at once.
     if rotation_pole is not None:
-        for i, ll in enumerate(lon_lat):
-            pole = Pole(ll[0], ll[1], 1.0)
-            pole.rotate( rotation_pole, angle )
-            lon_lat[i][0] = pole.longitude
-            lon_lat[i][1] = pole.latitude
+        vecs = rotations.spherical_to_cartesian(lon_lat[:, 0], lon_lat[:, 1], 1.)
+        vecs = rotations.rotate(vecs, rotation_pole._pole, float(angle))
+        lons, lats, norms = rotations.cartesian_to_spherical(np.transpose(vecs))
+        lon_lat = np.transpose(np.array([lons, lats]))
 
-    lon_lat = np.array(lon_lat)
     # Sometimes the last point messes up the plot (for reasons I don't understand).
     # Just exclude it.
     artist = ax.plot( lon_lat[:-1,0], lon_lat[:-1,1] , transform=ccrs.PlateCarree(), **kwargs)
     return artist
+
+
+def plot_paths(ax, pathlons, pathlats, **kwargs):
+    """
+    Plot a set of paths, such as those from
+    APWPath.compute_synthetic_paths, where each row of the
+    pathlons and pathlats arrays is one path. The paths are
+    drawn as a single LineCollection, which is much faster
+    than plotting each of them separately.
+    """
+    segments = np.stack((pathlons, pathlats), axis=-1)
+    collection = LineCollection(segments, transform=ccrs.PlateCarree(), **kwargs)
+    artist = ax.add_collection(collection)
+    return artist
@@ -26,6 +26,8 @@ class Pole(object):
         """
         Initialize the pole with lon, lat, and norm.
         """
+        assert not (np.any(latitude < -90.) or np.any(latitude > 90.)), \
+            "Latitude must be within [-90, 90]"
         self._pole = rot.spherical_to_cartesian(longitude, latitude, norm)
         self._pole = np.asarray(self._pole)
         self._angular_error = angular_error
@@ -57,15 +59,8 @@ class Pole(object):
         # The idea is to rotate the pole so that the Euler pole is
         # at the pole of the coordinate system, then perform the
         # requested rotation, then restore things to the original
-        # orientation
-        p = pole._pole
-        lon, lat, norm = rot.cartesian_to_spherical(p)
-        colat = 90. - lat
-        m1 = rot.construct_euler_rotation_matrix(
-            -lon[0] * rot.d2r, -colat[0] * rot.d2r, angle * rot.d2r)
-        m2 = rot.construct_euler_rotation_matrix(
-            0., colat[0] * rot.d2r, lon[0] * rot.d2r)
-        self._pole = np.dot(m2, np.dot(m1, self._pole))
+        # orientation. rot.rotate does all of that in one step.
+        self._pole = rot.rotate(self._pole, pole._pole, float(angle))
 
     def add(self, pole):
         self._pole = self._pole + pole._pole
@@ -77,10 +72,10 @@ class Pole(object):
             lats = np.ones_like(lons) * (90. - self._angular_error)
             norms = np.ones_like(lons)
             vecs = rot.spherical_to_cartesian(lons, lats, norms)
-            rotation_matrix = rot.construct_euler_rotation_matrix(
-                0., (self.colatitude) * rot.d2r, self.longitude * rot.d2r)
+            rotation_matrix = rot._euler_matrix_ab(
+                self.colatitude * rot.d2r, self.longitude * rot.d2r)
             rotated_vecs = np.dot(rotation_matrix, vecs)
-            lons, lats, norms = rot.cartesian_to_spherical(rotated_vecs)
+            lons, lats, norms = rot.cartesian_to_spherical(np.transpose(rotated_vecs))
             if south_pole is True:
                 lons = lons-180.
                 lats = -lats
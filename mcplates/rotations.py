@@ -1,22 +1,80 @@
 import numpy as np
 
+try:
+    from numba import njit
+except ImportError:
+    # Without numba the kernels below run as plain NumPy code.
+    def njit(*args, **kwargs):
+        return lambda f: f
+
 d2r = np.pi / 180.
 r2d = 180. / np.pi
 
 
+@njit(cache=True, fastmath=True)
 def rotate(pole, rotation_pole, angle):
     # The idea is to rotate the pole so that the Euler pole is
     # at the pole of the coordinate system, then perform the
     # requested rotation, then restore things to the original
-    # orientation
-    lon, lat, norm = cartesian_to_spherical(rotation_pole)
-    colat = 90. - lat
-    m1 = construct_euler_rotation_matrix(-lon[0]
-                                         * d2r, -colat[0] * d2r, angle * d2r)
-    m2 = construct_euler_rotation_matrix(0., colat[0] * d2r, lon[0] * d2r)
-    return np.dot(m2, np.dot(m1, pole))
+    # orientation. Composing those rotations gives the closed
+    # form axis-angle rotation matrix, which is applied directly.
+    norm = np.sqrt(rotation_pole[0] * rotation_pole[0] +
+                   rotation_pole[1] * rotation_pole[1] +
+                   rotation_pole[2] * rotation_pole[2])
+    if norm == 0.:
+        return pole.copy()
+    kx = rotation_pole[0] / norm
+    ky = rotation_pole[1] / norm
+    kz = rotation_pole[2] / norm
+    c = np.cos(angle * d2r)
+    s = np.sin(angle * d2r)
+    t = 1. - c
+    x = pole[0]
+    y = pole[1]
+    z = pole[2]
+    rotated = np.empty_like(pole)
+    rotated[0] = (c + kx * kx * t) * x + (kx * ky * t - kz * s) * y + (kx * kz * t + ky * s) * z
+    rotated[1] = (ky * kx * t + kz * s) * x + (c + ky * ky * t) * y + (ky * kz * t - kx * s) * z
+    rotated[2] = (kz * kx * t - ky * s) * x + (kz * ky * t + kx * s) * y + (c + kz * kz * t) * z
+    return rotated
+
 
+def _rotate_batch(poles, rotation_poles, angles):
+    """
+    Rotate each of the (n,3) array of poles by angles[i] (in degrees)
+    about the corresponding row of the (n,3) array of rotation_poles,
+    which need not be normalized. Zero length rotation poles leave
+    their poles unchanged.
+
+    Only ufuncs and functions that NumPy dispatches on their arguments
+    are used, so this also works on e.g. CuPy arrays. NumPy arrays
+    should go through the compiled rotate_batch.
+    """
+    norm = np.sqrt(rotation_poles[:, 0] * rotation_poles[:, 0] +
+                   rotation_poles[:, 1] * rotation_poles[:, 1] +
+                   rotation_poles[:, 2] * rotation_poles[:, 2])
+    nonzero = norm > 0.
+    norm = np.where(nonzero, norm, 1.)
+    kx = rotation_poles[:, 0] / norm
+    ky = rotation_poles[:, 1] / norm
+    kz = rotation_poles[:, 2] / norm
+    c = np.where(nonzero, np.cos(angles * d2r), 1.)
+    s = np.where(nonzero, np.sin(angles * d2r), 0.)
+    t = 1. - c
+    x = poles[:, 0]
+    y = poles[:, 1]
+    z = poles[:, 2]
+    rotated = np.empty_like(poles)
+    rotated[:, 0] = (c + kx * kx * t) * x + (kx * ky * t - kz * s) * y + (kx * kz * t + ky * s) * z
+    rotated[:, 1] = (ky * kx * t + kz * s) * x + (c + ky * ky * t) * y + (ky * kz * t - kx * s) * z
+    rotated[:, 2] = (kz * kx * t - ky * s) * x + (kz * ky * t + kx * s) * y + (c + kz * kz * t) * z
+    return rotated
 
+
+rotate_batch = njit(cache=True, fastmath=True)(_rotate_batch)
+
+
+@njit(cache=True, fastmath=True)
 def construct_euler_rotation_matrix(alpha, beta, gamma):
     """
     Make a 3x3 matrix which represents a rigid body rotation,
@@ -26,34 +84,55 @@ def construct_euler_rotation_matrix(alpha, beta, gamma):
 
     All angles are assumed to be in radians
     """
-    rot_alpha = np.array([[np.cos(alpha), -np.sin(alpha), 0.],
-                          [np.sin(alpha), np.cos(alpha), 0.],
-                          [0., 0., 1.]])
-    rot_beta = np.array([[np.cos(beta), 0., np.sin(beta)],
-                         [0., 1., 0.],
-                         [-np.sin(beta), 0., np.cos(beta)]])
-    rot_gamma = np.array([[np.cos(gamma), -np.sin(gamma), 0.],
-                          [np.sin(gamma), np.cos(gamma), 0.],
-                          [0., 0., 1.]])
-    rot = np.dot(rot_gamma, np.dot(rot_beta, rot_alpha))
+    # The product rot_gamma . rot_beta . rot_alpha, written out
+    ca, sa = np.cos(alpha), np.sin(alpha)
+    cb, sb = np.cos(beta), np.sin(beta)
+    cg, sg = np.cos(gamma), np.sin(gamma)
+    rot = np.array([[cg * cb * ca - sg * sa, -cg * cb * sa - sg * ca, cg * sb],
+                    [sg * cb * ca + cg * sa, -sg * cb * sa + cg * ca, sg * sb],
+                    [-sb * ca, sb * sa, cb]])
+    return rot
+
+
+@njit(cache=True, fastmath=True)
+def _euler_matrix_ab(beta, gamma):
+    """
+    The rotation matrix of construct_euler_rotation_matrix
+    for the common case of alpha = 0, i.e. a rotation about
+    the y axis by beta followed by one about the z axis by gamma.
+
+    All angles are assumed to be in radians
+    """
+    cb, sb = np.cos(beta), np.sin(beta)
+    cg, sg = np.cos(gamma), np.sin(gamma)
+    rot = np.array([[cg * cb, -sg, cg * sb],
+                    [sg * cb, cg, sg * sb],
+                    [-sb, 0., cb]])
     return rot
 
 
 def spherical_to_cartesian(longitude, latitude, norm):
-    #    assert(np.all(longitude >= 0.) and np.all(longitude <= 360.))
-    #    assert(np.all(latitude >= -90.) and np.all(latitude <= 90.))
-    #    assert(np.all(norm >= 0.))
-    colatitude = 90. - latitude
-    return np.array([norm * np.sin(colatitude * d2r) * np.cos(longitude * d2r),
-                     norm * np.sin(colatitude * d2r) * np.sin(longitude * d2r),
-                     norm * np.cos(colatitude * d2r)])
+    # Arguments are validated where poles are constructed,
+    # keeping this conversion free of checks.
+    latitude = latitude * d2r
+    cos_latitude = np.cos(latitude)
+    return np.array([norm * cos_latitude * np.cos(longitude * d2r),
+                     norm * cos_latitude * np.sin(longitude * d2r),
+                     norm * np.sin(latitude)])
 
 
 def cartesian_to_spherical(vecs):
-    v = np.reshape(vecs, (3, -1))
-    norm = np.sqrt(v[0, :] * v[0, :] + v[1, :] * v[1, :] + v[2, :] * v[2, :])
-    latitude = 90. - np.arccos(v[2, :] / norm) * r2d
-    longitude = np.arctan2(v[1, :], v[0, :]) * r2d
+    """
+    Convert an array of cartesian vectors with shape (...,3) to
+    arrays of longitudes, latitudes (in degrees) and norms with
+    shape (...).
+    """
+    vecs = np.asarray(vecs)
+    x, y, z = vecs[..., 0], vecs[..., 1], vecs[..., 2]
+    hxy = np.hypot(x, y)
+    norm = np.hypot(hxy, z)
+    latitude = np.arctan2(z, hxy) * r2d
+    longitude = np.arctan2(y, x) * r2d
     return longitude, latitude, norm
 
 def clamp_longitude( lons ):
@@ -35,8 +35,7 @@ def plot_result():
         mcplates.plot.plot_distribution( ax, directions[:,0], directions[:,1])
 
     pathlons, pathlats = path.compute_synthetic_paths(n=100)
-    for pathlon,pathlat in zip(pathlons,pathlats):
-        ax.plot(pathlon,pathlat, transform=ccrs.PlateCarree(), color='b', alpha=0.05 )
+    mcplates.plot.plot_paths(ax, pathlons, pathlats, color='b', alpha=0.05)
 
     for p in lon_lats:
         pole = mcplates.PaleomagneticPole( p[0], p[1], angular_error=10. )
@@ -45,8 +44,21 @@ def plot_result():
 
     plt.show()
 
+def check_parallel_sampling():
+    # A couple of short chains in worker processes, combined
+    # into the traces used for the synthetic paths
+    parallel_path = mcplates.APWPath( 'apw_parallel', poles, 2 )
+    parallel_path.create_model()
+    parallel_path.sample_mcmc_parallel(nsample=200, n_chains=2)
+    assert len(parallel_path.euler_rates()[0]) > 0
+
+    pathlons, pathlats = parallel_path.compute_synthetic_paths(n=10)
+    assert pathlons.shape == (10, 100) and pathlats.shape == (10, 100)
+    assert np.all(np.isfinite(pathlons)) and np.all(np.isfinite(pathlats))
+
 if __name__ == "__main__":
     import os 
+    check_parallel_sampling()
     if os.path.isfile(path.dbname):
         path.load_mcmc()
     else: